@@ -32,6 +32,7 @@ class RunNode:
         parser.add_argument('--stratum', type=int, help='Port to run stratum server')
         parser.add_argument('--data', help='Data directory')
         parser.add_argument('--rocksdb-storage', action='store_true', help='Use RocksDB storage backend')
+        parser.add_argument('--lmdb-storage', action='store_true', help='Use LMDB storage backend')
         parser.add_argument('--wallet', help='Set wallet type. Options are hd (Hierarchical Deterministic) or keypair',
                             default=None)
         parser.add_argument('--wallet-enable-api', action='store_true',
@@ -122,6 +123,15 @@ class RunNode:
                 tx_dir = os.path.join(args.data, 'tx.db')
                 tx_storage = TransactionRocksDBStorage(path=tx_dir, with_index=(not args.cache))
                 print('Using TransactionRocksDBStorage at {}'.format(tx_dir))
+            elif args.lmdb_storage:
+                try:
+                    from hathor.transaction.storage.lmdb_storage import TransactionLMDBStorage
+                except ImportError:
+                    print('The LMDB storage backend requires the lmdb package, install it with `pip install lmdb`.')
+                    sys.exit(-1)
+                tx_dir = os.path.join(args.data, 'tx.lmdb')
+                tx_storage = TransactionLMDBStorage(path=tx_dir, with_index=(not args.cache))
+                print('Using TransactionLMDBStorage at {}'.format(tx_dir))
             else:
                 tx_dir = os.path.join(args.data, 'tx')
                 tx_storage = TransactionCompactStorage(path=tx_dir, with_index=(not args.cache))
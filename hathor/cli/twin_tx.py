@@ -1,7 +1,9 @@
 import struct
+import sys
 import urllib.parse
 from argparse import ArgumentParser, Namespace
 from json.decoder import JSONDecodeError
+from typing import Optional, TextIO
 
 import requests
 
@@ -19,9 +21,12 @@ def create_parser() -> ArgumentParser:
     return parser
 
 
-def execute(args: Namespace) -> None:
+def execute(args: Namespace, out: Optional[TextIO] = None) -> None:
     from hathor.transaction import Transaction
 
+    if out is None:
+        out = sys.stdout
+
     # Get tx you want to create a twin
     if args.url and args.hash:
         get_tx_url = urllib.parse.urljoin(args.url, 'transaction/')
@@ -30,15 +35,15 @@ def execute(args: Namespace) -> None:
         try:
             data = response.json()
         except JSONDecodeError as e:
-            print('Error decoding transaction data')
-            print(e)
+            print('Error decoding transaction data', file=out)
+            print(e, file=out)
             return
 
         tx_bytes = bytes.fromhex(data['tx']['raw'])
     elif args.raw_tx:
         tx_bytes = bytes.fromhex(args.raw_tx)
     else:
-        print('The command expects raw_tx or hash and url as parameters')
+        print('The command expects raw_tx or hash and url as parameters', file=out)
         return
 
     try:
@@ -56,13 +61,13 @@ def execute(args: Namespace) -> None:
             try:
                 data = response.json()
             except JSONDecodeError as e:
-                print('Error decoding tips')
-                print(e)
+                print('Error decoding tips', file=out)
+                print(e, file=out)
                 return
 
             parents = data[:2]
             if len(parents) == 0:
-                print('No available tips to be selected as parents')
+                print('No available tips to be selected as parents', file=out)
                 return
             elif len(parents) == 1:
                 parents = [parents[0], twin.parents[0].hex()]
@@ -77,11 +82,11 @@ def execute(args: Namespace) -> None:
 
         twin.resolve()
         if args.human:
-            print(twin.to_json())
+            print(twin.to_json(), file=out)
         else:
-            print(twin.get_struct().hex())
+            print(twin.get_struct().hex(), file=out)
     except (struct.error, ValueError):
-        print('Error getting transaction from bytes')
+        print('Error getting transaction from bytes', file=out)
         return
 
 
@@ -23,7 +23,7 @@ from _hashlib import HASH
 from abc import ABC, abstractclassmethod, abstractmethod
 from enum import IntEnum
 from math import inf, isfinite, log
-from struct import error as StructError, pack
+from struct import Struct, error as StructError, pack
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple, Type
 
 from structlog import get_logger
@@ -58,6 +58,11 @@ MAX_NUM_OUTPUTS = settings.MAX_NUM_OUTPUTS
 MAX_OUTPUT_VALUE = 2**63  # max value (inclusive) that is possible to encode: 9223372036854775808 ~= 9.22337e+18
 _MAX_OUTPUT_VALUE_32 = 2**31 - 1  # max value (inclusive) before having to use 8 bytes: 2147483647 ~= 2.14748e+09
 
+# Precompiled structs used to decode output values, the high byte tells which of the other two is used
+_OUTPUT_VALUE_HIGH_BYTE_STRUCT = Struct('!b')
+_OUTPUT_VALUE_32_STRUCT = Struct('!i')
+_OUTPUT_VALUE_64_STRUCT = Struct('!q')
+
 TX_HASH_SIZE = 32   # 256 bits, 32 bytes
 
 # H = unsigned short (2 bytes), d = double(8), f = float(4), I = unsigned int (4),
@@ -351,8 +356,9 @@ class BaseTransaction(ABC):
             else:
                 return False
         else:
-            from hathor.transaction.genesis import get_genesis_transactions
-            for genesis in get_genesis_transactions(self.storage):
+            # only the hashes are compared, so there's no need to clone the genesis like get_genesis_transactions
+            from hathor.transaction.genesis import GENESIS
+            for genesis in GENESIS:
                 if self == genesis:
                     return True
             return False
@@ -877,6 +883,8 @@ class BaseTransaction(ABC):
 
 
 class TxInput:
+    __slots__ = ('tx_id', 'index', 'data', '_tx')
+
     _tx: BaseTransaction  # XXX: used for caching on hathor.transaction.Transaction.get_spent_tx
 
     def __init__(self, tx_id: bytes, index: int, data: bytes) -> None:
@@ -976,6 +984,7 @@ class TxInput:
 
 
 class TxOutput:
+    __slots__ = ('value', 'script', 'token_data')
 
     # first bit in the index byte indicates whether it's an authority output
     TOKEN_INDEX_MASK = 0b01111111
@@ -1105,17 +1114,18 @@ class TxOutput:
 
 
 def bytes_to_output_value(buf: bytes) -> Tuple[int, bytes]:
-    (value_high_byte,), _ = unpack('!b', buf)
+    (value_high_byte,) = _OUTPUT_VALUE_HIGH_BYTE_STRUCT.unpack_from(buf)
     if value_high_byte < 0:
-        output_struct = '!q'
+        output_struct = _OUTPUT_VALUE_64_STRUCT
         value_sign = -1
     else:
-        output_struct = '!i'
+        output_struct = _OUTPUT_VALUE_32_STRUCT
         value_sign = 1
     try:
-        (signed_value,), buf = unpack(output_struct, buf)
+        (signed_value,) = output_struct.unpack_from(buf)
     except StructError as e:
         raise InvalidOutputValue('Invalid byte struct for output') from e
+    buf = buf[output_struct.size:]
     value = signed_value * value_sign
     assert value >= 0
     if value < _MAX_OUTPUT_VALUE_32 and value_high_byte < 0:
@@ -20,6 +20,7 @@ import hashlib
 import re
 import struct
 from enum import IntEnum
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Type, Union
 
 from cryptography.exceptions import InvalidSignature
@@ -59,13 +60,35 @@ settings = HathorSettings()
 #      for signaling that an OP was applied on a wrongly typed stack.
 Stack = List[Union[bytes, int, str]]
 
+# Precompiled big-endian unsigned integer structs, indexed by their size in bytes
+_UINT_STRUCTS = {
+    1: struct.Struct('!B'),
+    2: struct.Struct('!H'),
+    4: struct.Struct('!I'),
+    8: struct.Struct('!Q'),
+}
+_UINT32_STRUCT = _UINT_STRUCTS[4]
+
+
+@lru_cache(maxsize=1024)
+def _get_public_key(pubkey: bytes) -> ec.EllipticCurvePublicKey:
+    """ Cached version of `get_public_key_from_bytes_compressed`.
+
+    Decoding a compressed point is a large part of every signature check and the same public key is commonly used by
+    many inputs, the returned key objects are immutable so they can be shared.
+    """
+    return get_public_key_from_bytes_compressed(pubkey)
+
 
 class ScriptExtras(NamedTuple):
     tx: Transaction
     txin: TxInput
     spent_tx: BaseTransaction
+    # sighash_all of `tx`, when already computed by the caller, it's the same for all inputs
+    sighash_all: Optional[bytes] = None
 
 
+@lru_cache(maxsize=256)
 def re_compile(pattern: str) -> Pattern[bytes]:
     """ Transform a given script pattern into a regular expression.
 
@@ -82,6 +105,8 @@ def re_compile(pattern: str) -> Pattern[bytes]:
     ...     'OP_DUP OP_HASH160 (DATA_20) OP_EQUALVERIFY OP_CHECKSIG$'
     ... )
 
+    Compiled patterns are cached, so compiling the same script pattern again is cheap.
+
     :return: A compiled regular expression matcher
     :rtype: :py:class:`re.Pattern`
     """
@@ -153,6 +178,13 @@ class Opcode(IntEnum):
     OP_DATA_MATCH_VALUE = 0xD1
 
 
+# Looking up a member on an Enum class is much slower than reading a global, so the opcodes checked for every
+# byte in execute_eval are also kept as plain ints
+_OP_PUSHDATA1 = int(Opcode.OP_PUSHDATA1)
+_OP_0 = int(Opcode.OP_0)
+_OP_16 = int(Opcode.OP_16)
+
+
 class HathorScript:
     """This class is supposes to being a helper creating the scripts. It abstracts
     some of the corner cases when building the script.
@@ -167,26 +199,35 @@ class HathorScript:
     log = Logger()
 
     def __init__(self) -> None:
-        self.data = b''
+        # the script is built in a mutable buffer, so each push is an amortized append instead of a new bytes copy
+        self._data = bytearray()
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._data)
+
+    @data.setter
+    def data(self, data: bytes) -> None:
+        self._data = bytearray(data)
 
     def addOpcode(self, opcode: Opcode) -> None:
-        self.data += bytes([opcode])
+        self._data.append(opcode)
 
     def pushData(self, data: Union[int, bytes]) -> None:
         if isinstance(data, int):
             if data > 4294967295:
-                n = struct.pack('!Q', data)
+                n = _UINT_STRUCTS[8].pack(data)
             elif data > 65535:
-                n = struct.pack('!I', data)
+                n = _UINT_STRUCTS[4].pack(data)
             elif data > 255:
-                n = struct.pack('!H', data)
+                n = _UINT_STRUCTS[2].pack(data)
             else:
-                n = struct.pack('!B', data)
+                n = _UINT_STRUCTS[1].pack(data)
             data = n
-        if len(data) <= 75:
-            self.data += (bytes([len(data)]) + data)
-        else:
-            self.data += (bytes([Opcode.OP_PUSHDATA1]) + bytes([len(data)]) + data)
+        if len(data) > 75:
+            self._data.append(Opcode.OP_PUSHDATA1)
+        self._data.append(len(data))
+        self._data.extend(data)
 
 
 class P2PKH:
@@ -275,7 +316,7 @@ class P2PKH:
             pushdata_timelock = groups[0]
             if pushdata_timelock:
                 timelock_bytes = pushdata_timelock[1:]
-                timelock = struct.unpack('!I', timelock_bytes)[0]
+                (timelock,) = _UINT32_STRUCT.unpack(timelock_bytes)
             pushdata_address = groups[1]
             public_key_hash = get_pushdata(pushdata_address)
             address_b58 = get_address_b58_from_public_key_hash(public_key_hash)
@@ -375,7 +416,7 @@ class MultiSig:
             pushdata_timelock = groups[0]
             if pushdata_timelock:
                 timelock_bytes = pushdata_timelock[1:]
-                timelock = struct.unpack('!I', timelock_bytes)[0]
+                (timelock,) = _UINT32_STRUCT.unpack(timelock_bytes)
             redeem_script_hash = get_pushdata(groups[1])
             address_b58 = get_address_b58_from_redeem_script_hash(redeem_script_hash)
             return cls(address_b58, timelock)
@@ -478,7 +519,7 @@ class NanoContractMatchValues:
         s.addOpcode(Opcode.OP_DATA_STREQUAL)
         # compare second value from data with min_timestamp
         s.addOpcode(Opcode.OP_1)
-        s.pushData(struct.pack('!I', self.min_timestamp))
+        s.pushData(_UINT32_STRUCT.pack(self.min_timestamp))
         s.addOpcode(Opcode.OP_DATA_GREATERTHAN)
         # finally, compare third value with values on dict
         s.addOpcode(Opcode.OP_2)
@@ -641,12 +682,12 @@ def execute_eval(data: bytes, log: List[str], extras: ScriptExtras) -> None:
         if (opcode >= 1 and opcode <= 75):
             pos = op_pushdata(pos, data, stack)
             continue
-        elif opcode == Opcode.OP_PUSHDATA1:
+        elif opcode == _OP_PUSHDATA1:
             pos = op_pushdata1(pos, data, stack)
             continue
 
         # Checking if the opcode is an integer push (OP_0 - OP_16)
-        if opcode >= Opcode.OP_0 and opcode <= Opcode.OP_16:
+        if _OP_0 <= opcode <= _OP_16:
             op_integer(opcode, stack, log, extras)
             pos += 1
             continue
@@ -675,7 +716,8 @@ def evaluate_final_stack(stack: Stack, log: List[str]) -> None:
             raise FinalStackInvalid('\n'.join(log))
 
 
-def script_eval(tx: Transaction, txin: TxInput, spent_tx: BaseTransaction) -> None:
+def script_eval(tx: Transaction, txin: TxInput, spent_tx: BaseTransaction,
+                sighash_all: Optional[bytes] = None) -> None:
     """Evaluates the output script and input data according to
     a very limited subset of Bitcoin's scripting language.
 
@@ -688,6 +730,9 @@ def script_eval(tx: Transaction, txin: TxInput, spent_tx: BaseTransaction) -> No
     :param spent_tx: the transaction referenced by the input
     :type spent_tx: :py:class:`hathor.transaction.BaseTransaction`
 
+    :param sighash_all: `tx.get_sighash_all()`, if the caller already has it; computed when needed otherwise
+    :type sighash_all: Optional[bytes]
+
     :raises ScriptError: if script verification fails
     """
     input_data = txin.data
@@ -696,7 +741,7 @@ def script_eval(tx: Transaction, txin: TxInput, spent_tx: BaseTransaction) -> No
     # merge input_data and output_script
     full_data = input_data + output_script
     log: List[str] = []
-    extras = ScriptExtras(tx=tx, txin=txin, spent_tx=spent_tx)
+    extras = ScriptExtras(tx=tx, txin=txin, spent_tx=spent_tx, sighash_all=sighash_all)
     execute_eval(full_data, log, extras)
 
     # If it's multisig we still have to validate the script in input data
@@ -744,11 +789,10 @@ def get_data_value(k: int, data: bytes) -> bytes:
             # TODO throw error
             pass
         position += 1
-        if (position + length) > len(data):
-            raise OutOfData('trying to read {} bytes starting at {}, available {}'.format(length, position, len(data)))
-        value = data[position:position + length]
+        if (position + length) > data_len:
+            raise OutOfData('trying to read {} bytes starting at {}, available {}'.format(length, position, data_len))
         if iteration == k:
-            return value
+            return data[position:position + length]
         iteration += 1
         position += length
     raise DataIndexError
@@ -760,18 +804,11 @@ def binary_to_int(binary: bytes) -> int:
     :param binary: value to convert
     :type binary: bytes
     """
-    if len(binary) == 1:
-        _format = '!B'
-    elif len(binary) == 2:
-        _format = '!H'
-    elif len(binary) == 4:
-        _format = '!I'
-    elif len(binary) == 8:
-        _format = '!Q'
-    else:
+    _struct = _UINT_STRUCTS.get(len(binary))
+    if _struct is None:
         raise struct.error
 
-    (value,) = struct.unpack(_format, binary)
+    (value,) = _struct.unpack(binary)
     return value
 
 
@@ -859,7 +896,7 @@ def op_greaterthan_timestamp(stack: Stack, log: List[str], extras: ScriptExtras)
         raise MissingStackItems('OP_GREATERTHAN_TIMESTAMP: empty stack')
     buf = stack.pop()
     assert isinstance(buf, bytes)
-    (timelock,) = struct.unpack('!I', buf)
+    (timelock,) = _UINT32_STRUCT.unpack(buf)
     if extras.tx.timestamp <= timelock:
         raise TimeLocked('The output is locked until {}'.format(
             datetime.datetime.fromtimestamp(timelock).strftime("%m/%d/%Y %I:%M:%S %p")))
@@ -919,19 +956,40 @@ def op_checksig(stack: Stack, log: List[str], extras: ScriptExtras) -> None:
     signature = stack.pop()
     assert isinstance(pubkey, bytes)
     assert isinstance(signature, bytes)
-    public_key = get_public_key_from_bytes_compressed(pubkey)
-    data_to_sign = extras.tx.get_sighash_all()
-    hashed_data = hashlib.sha256(data_to_sign).digest()
-    try:
-        public_key.verify(signature, hashed_data, ec.ECDSA(hashes.SHA256()))
+    public_key = _get_public_key(pubkey)
+    hashed_data = _get_hashed_sighash_all(extras)
+    if _verify_signature(public_key, signature, hashed_data):
         # valid, push true to stack
         stack.append(1)
-    except InvalidSignature:
+    else:
         # invalid, push false to stack
         stack.append(0)
         log.append('OP_CHECKSIG: failed')
 
 
+def _get_hashed_sighash_all(extras: ScriptExtras) -> bytes:
+    """Return the sha256 of the sighash_all of the tx being verified, which is the data checked by signatures
+
+    Notice that `_verify_signature` uses `ec.ECDSA(hashes.SHA256())`, which hashes it once more, so signatures are
+    over sha256(sha256(sighash_all)), the same prehashed message signed by `HDWallet.get_input_aux_data`. This is
+    part of the protocol and must not be replaced by a `Prehashed` verification.
+    """
+    data_to_sign = extras.sighash_all
+    if data_to_sign is None:
+        data_to_sign = extras.tx.get_sighash_all()
+    return hashlib.sha256(data_to_sign).digest()
+
+
+def _verify_signature(public_key: ec.EllipticCurvePublicKey, signature: bytes, hashed_data: bytes) -> bool:
+    """Return whether `signature` of `hashed_data` is valid for `public_key`
+    """
+    try:
+        public_key.verify(signature, hashed_data, ec.ECDSA(hashes.SHA256()))
+    except InvalidSignature:
+        return False
+    return True
+
+
 def op_hash160(stack: Stack, log: List[str], extras: ScriptExtras) -> None:
     """Top stack item is hashed twice: first with SHA-256 and then with RIPEMD-160.
     Result is pushed back to stack.
@@ -967,7 +1025,7 @@ def op_checkdatasig(stack: Stack, log: List[str], extras: ScriptExtras) -> None:
     assert isinstance(pubkey, bytes)
     assert isinstance(signature, bytes)
     assert isinstance(data, bytes)
-    public_key = get_public_key_from_bytes_compressed(pubkey)
+    public_key = _get_public_key(pubkey)
     try:
         public_key.verify(signature, data, ec.ECDSA(hashes.SHA256()))
         # valid, push true to stack
@@ -1171,11 +1229,13 @@ def op_find_p2pkh(stack: Stack, log: List[str], extras: ScriptExtras) -> None:
     address = stack.pop()
     address_b58 = get_address_b58_from_bytes(address)
     for output in tx.outputs:
+        # comparing the value is much cheaper than parsing the script, so it's done first
+        if output.value != contract_value:
+            continue
         p2pkh_out = P2PKH.parse_script(output.script)
-        if p2pkh_out:
-            if p2pkh_out.address == address_b58 and output.value == contract_value:
-                stack.append(1)
-                return
+        if p2pkh_out and p2pkh_out.address == address_b58:
+            stack.append(1)
+            return
     # didn't find any match
     raise VerifyFailed
 
@@ -1227,18 +1287,25 @@ def op_checkmultisig(stack: Stack, log: List[str], extras: ScriptExtras) -> None
         signature_bytes = stack.pop()
         signatures.append(signature_bytes)
 
+    # The signed data is the same for every signature, so it's hashed only once
+    hashed_data = _get_hashed_sighash_all(extras)
+
     # For each signature we check if it's valid with one of the public keys
-    # Signatures must be in order (same as the public keys in the multi sig wallet)
+    # Signatures must be in order (same as the public keys in the multi sig wallet), so each signature is only
+    # checked against the public keys after the one that matched the previous signature
+    pubkey_index = 0
     for signature in signatures:
+        assert isinstance(signature, bytes)
         valid = False
-        for index, pubkey in enumerate(pubkeys):
-            new_stack = [signature, pubkey]
-            op_checksig(new_stack, log, extras)
-            result = new_stack.pop()
-            if result == 1:
-                pubkeys = pubkeys[index + 1:]
+        while pubkey_index < len(pubkeys):
+            pubkey = pubkeys[pubkey_index]
+            pubkey_index += 1
+            assert isinstance(pubkey, bytes)
+            public_key = _get_public_key(pubkey)
+            if _verify_signature(public_key, signature, hashed_data):
                 valid = True
                 break
+            log.append('OP_CHECKSIG: failed')
 
         if not valid:
             # If one signature is not valid we push 0 and return
@@ -1263,7 +1330,7 @@ def op_integer(opcode: int, stack: Stack, log: List[str], extras: ScriptExtras)
         :param stack: the stack used when evaluating the script
         :type stack: List[]
     """
-    to_append = opcode - Opcode.OP_0
+    to_append = opcode - _OP_0
     if to_append < 0 or to_append > 16:
         raise ScriptError('unknown opcode {}'.format(opcode))
     stack.append(to_append)
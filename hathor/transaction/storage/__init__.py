@@ -11,6 +11,11 @@ try:
 except ImportError:
     pass
 
+try:
+    from hathor.transaction.storage.lmdb_storage import TransactionLMDBStorage
+except ImportError:
+    pass
+
 __all__ = [
     'TransactionStorage',
     'TransactionMemoryStorage',
@@ -20,5 +25,6 @@ __all__ = [
     'TransactionSubprocessStorage',
     'TransactionRemoteStorage',
     'TransactionRocksDBStorage',
+    'TransactionLMDBStorage',
     'create_transaction_storage_server',
 ]
@@ -155,7 +155,7 @@ class TransactionBinaryStorage(BaseTransactionStorage, TransactionStorageAsyncFr
             for f in it:
                 match = self.re_pattern.match(f.name)
                 if match:
-                    hash_bytes = bytes.fromhex(match.groups()[0])
+                    hash_bytes = bytes.fromhex(match.group(1))
                     tx = self.get_transaction_from_weakref(hash_bytes)
                     if tx is not None:
                         yield tx
@@ -1,11 +1,13 @@
-import base64
 import glob
 import json
 import os
 import re
+from base64 import b64decode
 from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 from hathor.conf import HathorSettings
+from hathor.transaction.aux_pow import BitcoinAuxPow
+from hathor.transaction.base_transaction import TxInput, TxOutput, TxVersion
 from hathor.transaction.storage.exceptions import TransactionDoesNotExist
 from hathor.transaction.storage.transaction_storage import BaseTransactionStorage, TransactionStorageAsyncFromSync
 from hathor.transaction.transaction_metadata import TransactionMetadata
@@ -32,6 +34,9 @@ class TransactionCompactStorage(BaseTransactionStorage, TransactionStorageAsyncF
         self.re_pattern = re.compile(filename_pattern)
         self.create_subfolders(self.path, settings.STORAGE_SUBFOLDERS)
 
+        # the subfolder is picked by the last byte of the hash, so there is one prefix per possible byte value
+        self._subfolder_prefixes = [os.path.join(self.path, '%0.2x' % i, 'tx_') for i in range(256)]
+
     def create_subfolders(self, path: str, num_subfolders: int) -> None:
         """ Create subfolders in the main tx storage folder.
 
@@ -80,11 +85,7 @@ class TransactionCompactStorage(BaseTransactionStorage, TransactionStorageAsyncF
         self.save_to_json(filepath, data)
 
     def generate_filepath(self, hash_bytes: bytes) -> str:
-        hash_hex = hash_bytes.hex()
-        filename = 'tx_{}.json'.format(hash_hex)
-        subfolder = hash_hex[-2:]
-        filepath = os.path.join(self.path, subfolder, filename)
-        return filepath
+        return self._subfolder_prefixes[hash_bytes[-1]] + hash_bytes.hex() + '.json'
 
     @deprecated('Use transaction_exists_deferred instead')
     def transaction_exists(self, hash_bytes: bytes) -> bool:
@@ -99,43 +100,33 @@ class TransactionCompactStorage(BaseTransactionStorage, TransactionStorageAsyncF
             json_file.write(json.dumps(data))
 
     def load_from_json(self, filepath: str, error: Exception) -> Dict[str, Any]:
-        if os.path.isfile(filepath):
+        try:
             with open(filepath, 'r') as json_file:
                 dict_data = json.loads(json_file.read())
                 return dict_data
-        else:
-            raise error
+        except FileNotFoundError:
+            raise error from None
 
     def load(self, data: Dict[str, Any]) -> 'BaseTransaction':
-        from hathor.transaction.aux_pow import BitcoinAuxPow
-        from hathor.transaction.base_transaction import TxOutput, TxInput, TxVersion
-
         hash_bytes = bytes.fromhex(data['hash'])
         if 'data' in data:
-            data['data'] = base64.b64decode(data['data'])
-
-        parents = []
-        for parent in data['parents']:
-            parents.append(bytes.fromhex(parent))
-        data['parents'] = parents
-
-        inputs = []
-        for input_tx in data['inputs']:
-            tx_id = bytes.fromhex(input_tx['tx_id'])
-            index = input_tx['index']
-            input_data = base64.b64decode(input_tx['data'])
-            inputs.append(TxInput(tx_id, index, input_data))
+            data['data'] = b64decode(data['data'])
+
+        data['parents'] = [bytes.fromhex(parent) for parent in data['parents']]
+
+        inputs = [
+            TxInput(bytes.fromhex(input_tx['tx_id']), input_tx['index'], b64decode(input_tx['data']))
+            for input_tx in data['inputs']
+        ]
         if len(inputs) > 0:
             data['inputs'] = inputs
         else:
             del data['inputs']
 
-        outputs = []
-        for output in data['outputs']:
-            value = output['value']
-            script = base64.b64decode(output['script'])
-            token_data = output['token_data']
-            outputs.append(TxOutput(value, script, token_data))
+        outputs = [
+            TxOutput(output['value'], b64decode(output['script']), output['token_data'])
+            for output in data['outputs']
+        ]
         if len(outputs) > 0:
             data['outputs'] = outputs
 
@@ -169,7 +160,7 @@ class TransactionCompactStorage(BaseTransactionStorage, TransactionStorageAsyncF
         filepath = self.generate_filepath(hash_bytes)
         data = self.load_from_json(filepath, TransactionDoesNotExist(hash_bytes.hex()))
         tx = self.load(data['tx'])
-        if 'meta' in data.keys():
+        if 'meta' in data:
             meta = TransactionMetadata.create_from_json(data['meta'])
             tx._metadata = meta
         self._save_to_weakref(tx)
@@ -182,23 +173,33 @@ class TransactionCompactStorage(BaseTransactionStorage, TransactionStorageAsyncF
         for tx in self.get_all_genesis():
             yield tx
 
-        for f in glob.iglob(os.path.join(self.path, '*/*')):
-            match = self.re_pattern.match(os.path.basename(f))
+        create_metadata = TransactionMetadata.create_from_json
+        for entry in self._iter_subfolder_entries():
+            match = self.re_pattern.match(entry.name)
             if match:
-                hash_bytes = bytes.fromhex(match.groups()[0])
+                hash_bytes = bytes.fromhex(match.group(1))
                 tx = self.get_transaction_from_weakref(hash_bytes)
                 if tx is not None:
                     yield tx
                 else:
                     # TODO Return a proxy that will load the transaction only when it is used.
-                    data = self.load_from_json(f, TransactionDoesNotExist())
+                    data = self.load_from_json(entry.path, TransactionDoesNotExist())
                     tx = self.load(data['tx'])
-                    if 'meta' in data.keys():
-                        meta = TransactionMetadata.create_from_json(data['meta'])
-                        tx._metadata = meta
+                    if 'meta' in data:
+                        tx._metadata = create_metadata(data['meta'])
                     self._save_to_weakref(tx)
                     yield tx
 
+    def _iter_subfolder_entries(self) -> Iterator[os.DirEntry]:
+        """Iterate over the entries of all subfolders, files in the main folder are skipped."""
+        with os.scandir(self.path) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                with os.scandir(folder.path) as entries:
+                    for entry in entries:
+                        yield entry
+
     @deprecated('Use get_count_tx_blocks_deferred instead')
     def get_count_tx_blocks(self) -> int:
         genesis_len = len(self.get_all_genesis())
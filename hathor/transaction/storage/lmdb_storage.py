@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+import lmdb
+
+from hathor.transaction.storage.exceptions import TransactionDoesNotExist
+from hathor.transaction.storage.transaction_storage import BaseTransactionStorage, TransactionStorageAsyncFromSync
+from hathor.util import deprecated, skip_warning
+
+if TYPE_CHECKING:
+    from hathor.transaction import BaseTransaction
+
+# Maximum size the memory map is allowed to grow to, it's only address space, the file grows as needed
+DEFAULT_MAP_SIZE = 64 << 30
+
+# Number of transactions read per LMDB read transaction when iterating over all of them
+_ITER_BATCH_SIZE = 1000
+
+
+class TransactionLMDBStorage(BaseTransactionStorage, TransactionStorageAsyncFromSync):
+    """This storage keeps the transactions in an LMDB environment, an embedded memory-mapped B+tree
+
+    Each transaction is a single key, its hash, and the value is its Protobuf serialization including the metadata.
+    Genesis transactions are not written, they are always kept in memory. Reads don't copy the database into the
+    process, the pages are mapped from the file and `map_size` only reserves address space.
+    """
+
+    def __init__(self, path: str = './storage.lmdb', with_index: bool = True, map_size: int = DEFAULT_MAP_SIZE):
+        super().__init__(with_index=with_index)
+        self._env = lmdb.open(path, map_size=map_size, subdir=True)
+
+    def _load_from_bytes(self, data: bytes) -> 'BaseTransaction':
+        from hathor import protos
+        from hathor.transaction.base_transaction import tx_or_block_from_proto
+
+        tx_proto = protos.BaseTransaction()
+        tx_proto.ParseFromString(data)
+        return tx_or_block_from_proto(tx_proto, storage=self)
+
+    def _tx_to_bytes(self, tx: 'BaseTransaction') -> bytes:
+        tx_proto = tx.to_proto()
+        return tx_proto.SerializeToString()
+
+    @deprecated('Use remove_transaction_deferred instead')
+    def remove_transaction(self, tx: 'BaseTransaction') -> None:
+        skip_warning(super().remove_transaction)(tx)
+        with self._env.begin(write=True) as txn:
+            txn.delete(tx.hash)
+        self._remove_from_weakref(tx)
+
+    @deprecated('Use save_transaction_deferred instead')
+    def save_transaction(self, tx: 'BaseTransaction', *, only_metadata: bool = False) -> None:
+        skip_warning(super().save_transaction)(tx, only_metadata=only_metadata)
+        if tx.is_genesis:
+            return
+        self._save_transaction(tx, only_metadata=only_metadata)
+        self._save_to_weakref(tx)
+
+    def _save_transaction(self, tx: 'BaseTransaction', *, only_metadata: bool = False) -> None:
+        # genesis txs and metadata are kept in memory
+        if tx.is_genesis:
+            return
+        data = self._tx_to_bytes(tx)
+        key = tx.hash
+        with self._env.begin(write=True) as txn:
+            txn.put(key, data)
+
+    @deprecated('Use transaction_exists_deferred instead')
+    def transaction_exists(self, hash_bytes: bytes) -> bool:
+        genesis = self.get_genesis(hash_bytes)
+        if genesis:
+            return True
+        with self._env.begin() as txn:
+            return txn.get(hash_bytes) is not None
+
+    @deprecated('Use get_transaction_deferred instead')
+    def get_transaction(self, hash_bytes: bytes) -> 'BaseTransaction':
+        genesis = self.get_genesis(hash_bytes)
+        if genesis:
+            return genesis
+
+        tx = self.get_transaction_from_weakref(hash_bytes)
+        if tx is not None:
+            return tx
+
+        tx = self._get_transaction(hash_bytes)
+        if not tx:
+            raise TransactionDoesNotExist(hash_bytes.hex())
+
+        assert tx.hash == hash_bytes
+
+        self._save_to_weakref(tx)
+        return tx
+
+    def _get_transaction(self, hash_bytes: bytes) -> Optional['BaseTransaction']:
+        with self._env.begin() as txn:
+            data = txn.get(hash_bytes)
+        if data is None:
+            return None
+        tx = self._load_from_bytes(data)
+        return tx
+
+    @deprecated('Use get_all_transactions_deferred instead')
+    def get_all_transactions(self) -> Iterator['BaseTransaction']:
+        tx: Optional['BaseTransaction']
+
+        for tx in self.get_all_genesis():
+            yield tx
+
+        # a read transaction pins the pages it sees, so it's not kept open while the caller consumes the iterator,
+        # instead the keys are read in batches and each batch continues after the last key of the previous one
+        last_key: Optional[bytes] = None
+        while True:
+            batch: List[Tuple[bytes, bytes]] = []
+            with self._env.begin() as txn:
+                cursor = txn.cursor()
+                if last_key is None:
+                    found = cursor.first()
+                else:
+                    found = cursor.set_range(last_key)
+                    if found and cursor.key() == last_key:
+                        found = cursor.next()
+                while found and len(batch) < _ITER_BATCH_SIZE:
+                    batch.append((cursor.key(), cursor.value()))
+                    found = cursor.next()
+
+            for hash_bytes, data in batch:
+                tx = self.get_transaction_from_weakref(hash_bytes)
+                if tx is None:
+                    tx = self._load_from_bytes(data)
+                    assert tx.hash == hash_bytes
+                    self._save_to_weakref(tx)
+
+                assert tx is not None
+                yield tx
+
+            if len(batch) < _ITER_BATCH_SIZE:
+                break
+            last_key = batch[-1][0]
+
+    @deprecated('Use get_count_tx_blocks_deferred instead')
+    def get_count_tx_blocks(self) -> int:
+        genesis_len = len(self.get_all_genesis())
+        keys_count = self._env.stat()['entries']
+        return genesis_len + keys_count
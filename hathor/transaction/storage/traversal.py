@@ -1,29 +1,23 @@
 
 import heapq
 from abc import ABC, abstractmethod
-from itertools import chain
-from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Set
+from itertools import chain, count
+from typing import TYPE_CHECKING, Any, Iterator, List, NamedTuple, Optional, Set
 
 if TYPE_CHECKING:
     from hathor.transaction.storage import TransactionStorage  # noqa: F401
     from hathor.transaction import BaseTransaction  # noqa: F401
 
 
-class HeapItem:
+class HeapItem(NamedTuple):
     """ Used by the heap of the BFS to get the transactions sorted by timestamp.
-    """
-    def __init__(self, tx: 'BaseTransaction', *, reverse: bool = False):
-        self.tx = tx
-        if not reverse:
-            self.key = tx.timestamp
-        else:
-            self.key = -tx.timestamp
-
-    def __lt__(self, other: 'HeapItem') -> bool:
-        return self.key < other.key
 
-    def __le__(self, other: 'HeapItem') -> bool:
-        return self.key <= other.key
+    Being a tuple, items are compared in C instead of calling a Python `__lt__` for every comparison made
+    by `heapq`. The `seq` field breaks ties, so transactions themselves are never compared.
+    """
+    key: int
+    seq: int
+    tx: 'BaseTransaction'
 
 
 class GenericWalk(ABC):
@@ -125,8 +119,13 @@ class BFSWalk(GenericWalk):
     """
     to_visit: List[HeapItem]
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._seq = count()
+
     def _push_visit(self, tx: 'BaseTransaction') -> None:
-        heapq.heappush(self.to_visit, HeapItem(tx, reverse=self._reverse_heap))
+        key = -tx.timestamp if self._reverse_heap else tx.timestamp
+        heapq.heappush(self.to_visit, HeapItem(key, next(self._seq), tx))
 
     def _pop_visit(self) -> 'BaseTransaction':
         item = heapq.heappop(self.to_visit)
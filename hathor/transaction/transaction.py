@@ -402,6 +402,8 @@ class Transaction(BaseTransaction):
         """Verify inputs signatures and ownership and all inputs actually exist"""
         from hathor.transaction.storage.exceptions import TransactionDoesNotExist
 
+        # every input signs the same data, so it's serialized only once for all of them
+        sighash_all = self.get_sighash_all()
         spent_outputs: Set[Tuple[bytes, int]] = set()
         for input_tx in self.inputs:
             try:
@@ -425,7 +427,7 @@ class Transaction(BaseTransaction):
                 assert isinstance(spent_tx, Block)
                 self.verify_spent_reward(spent_tx)
 
-            self.verify_script(input_tx, spent_tx)
+            self.verify_script(input_tx, spent_tx, sighash_all)
 
             # check if any other input in this tx is spending the same output
             key = (input_tx.tx_id, input_tx.index)
@@ -453,14 +455,15 @@ class Transaction(BaseTransaction):
             raise RewardLocked(f'Reward needs {settings.REWARD_SPEND_MIN_BLOCKS} blocks to be spent, {spend_blocks} '
                                'not enough')
 
-    def verify_script(self, input_tx: TxInput, spent_tx: BaseTransaction) -> None:
+    def verify_script(self, input_tx: TxInput, spent_tx: BaseTransaction, sighash_all: Optional[bytes] = None) -> None:
         """
         :type input_tx: TxInput
         :type spent_tx: Transaction
+        :param sighash_all: the result of `self.get_sighash_all()`, computed when needed if not given
         """
         from hathor.transaction.scripts import script_eval
         try:
-            script_eval(self, input_tx, spent_tx)
+            script_eval(self, input_tx, spent_tx, sighash_all)
         except ScriptError as e:
             raise InvalidInputData(e) from e
 
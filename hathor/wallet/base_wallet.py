@@ -67,15 +67,15 @@ class BaseWallet:
         # Normal key pair wallet
         KEY_PAIR = 'keypair'
 
-    def __init__(self, directory: str = './', pubsub: Optional[PubSubManager] = None,
+    def __init__(self, directory: Optional[str] = './', pubsub: Optional[PubSubManager] = None,
                  reactor: Optional[IReactorCore] = None) -> None:
         """ A wallet will hold the unspent and spent transactions
 
         All files will be stored in the same directory, and it should
         only contain wallet associated files.
 
-        :param directory: where to store wallet associated files
-        :type directory: string
+        :param directory: where to store wallet associated files, None for a wallet that is only kept in memory
+        :type directory: Optional[string]
 
         :param pubsub: If not given, a new one is created.
         :type pubsub: :py:class:`hathor.pubsub.PubSubManager`
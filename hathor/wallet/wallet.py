@@ -18,7 +18,7 @@ from hathor.wallet.keypair import KeyPair
 class Wallet(BaseWallet):
     log = Logger()
 
-    def __init__(self, keys: Optional[Any] = None, directory: str = './', filename: str = 'keys.json',
+    def __init__(self, keys: Optional[Any] = None, directory: Optional[str] = './', filename: str = 'keys.json',
                  pubsub: Optional[Any] = None, reactor: Optional[Any] = None) -> None:
         """ A wallet will hold key pair objects and the unspent and
         spent transactions associated with the keys.
@@ -29,8 +29,8 @@ class Wallet(BaseWallet):
         :param keys: keys to initialize this wallet
         :type keys: Dict[string(base58), :py:class:`hathor.wallet.keypair.KeyPair`]
 
-        :param directory: where to store wallet associated files
-        :type directory: string
+        :param directory: where to store wallet associated files, if None the keys are only kept in memory
+        :type directory: Optional[string]
 
         :param filename: name of keys file
         :type filename: string
@@ -40,7 +40,8 @@ class Wallet(BaseWallet):
         """
         super().__init__(directory=directory, pubsub=pubsub, reactor=reactor)
 
-        self.filepath = os.path.join(directory, filename)
+        # in-memory wallets have no file
+        self.filepath: Optional[str] = os.path.join(directory, filename) if directory is not None else None
         self.keys: Dict[str, Any] = keys or {}  # Dict[string(b58_address), KeyPair]
 
         # Set[string(base58)]
@@ -58,17 +59,19 @@ class Wallet(BaseWallet):
         self.flush_schedule = None
 
     def _manually_initialize(self) -> None:
-        if os.path.isfile(self.filepath):
+        if self.filepath is not None and os.path.isfile(self.filepath):
             self.log.info('Loading keys...')
             self.read_keys_from_file()
 
     def read_keys_from_file(self):
         """Reads the keys from file and updates the keys dictionary
 
-        Uses the directory and filename specified in __init__
+        Uses the directory and filename specified in __init__, nothing is read for an in-memory wallet
 
         :rtype: None
         """
+        if self.filepath is None:
+            return
         new_keys = {}
         with open(self.filepath, 'r') as json_file:
             json_data = json.loads(json_file.read())
@@ -82,6 +85,9 @@ class Wallet(BaseWallet):
         self.keys.update(new_keys)
 
     def _write_keys_to_file_or_delay(self) -> None:
+        if self.filepath is None:
+            # in-memory wallet, there's nothing to flush
+            return
         dt = self.reactor.seconds() - self.last_flush_time
         if dt > self.flush_to_disk_interval:
             self._write_keys_to_file()
@@ -95,6 +101,9 @@ class Wallet(BaseWallet):
     def _write_keys_to_file(self) -> None:
         self.flush_schedule = None
         self.last_flush_time = self.reactor.seconds()
+        if self.filepath is None:
+            # in-memory wallet, there's no file to write
+            return
         data = [keypair.to_json() for keypair in self.keys.values()]
         with open(self.filepath, 'w') as json_file:
             json_file.write(json.dumps(data, indent=4))
@@ -1,3 +1,5 @@
+import shutil
+import tempfile
 from contextlib import redirect_stdout
 from io import StringIO
 
@@ -9,11 +11,14 @@ class MultisigAddressTest(unittest.TestCase):
     def setUp(self):
         super().setUp()
         self.parser = create_parser()
+        # without --dir the wallet keys would be written to the current directory
+        self.wallet_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.wallet_dir)
 
     def test_generate_address(self):
         # Generate address from 3 random pubkeys
         pubkey_count = 3
-        args = self.parser.parse_args(['2', '--pubkey_count', '{}'.format(pubkey_count)])
+        args = self.parser.parse_args(['2', '--pubkey_count', '{}'.format(pubkey_count), '--dir', self.wallet_dir])
         f = StringIO()
         with redirect_stdout(f):
             execute(args, '1234')
@@ -34,7 +39,8 @@ class MultisigAddressTest(unittest.TestCase):
         address = get_data(output, 37)
 
         # Generate address from given pubkeys
-        args = self.parser.parse_args(['2', '--public_keys', '{},{},{}'.format(pubkey1, pubkey2, pubkey3)])
+        args = self.parser.parse_args(['2', '--public_keys', '{},{},{}'.format(pubkey1, pubkey2, pubkey3),
+                                       '--dir', self.wallet_dir])
         f = StringIO()
         with redirect_stdout(f):
             execute(args, '1234')
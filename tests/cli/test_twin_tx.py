@@ -1,21 +1,14 @@
-import json
-import unittest as ut
-from contextlib import redirect_stdout
+import urllib.parse
 from io import StringIO
+from unittest.mock import Mock, patch
 
 from hathor.cli.twin_tx import create_parser, execute
 from hathor.conf import HathorSettings
-from hathor.transaction import Transaction, TransactionMetadata
+from hathor.transaction import Transaction
+from hathor.transaction.resources import TipsResource, TransactionResource
 from tests import unittest
-from tests.utils import (
-    add_blocks_unlock_reward,
-    add_new_blocks,
-    add_new_transactions,
-    execute_mining,
-    execute_tx_gen,
-    request_server,
-    run_server,
-)
+from tests.resources.base_resource import StubSite
+from tests.utils import add_blocks_unlock_reward, add_new_blocks, add_new_transactions, json_loads
 
 settings = HathorSettings()
 
@@ -30,37 +23,27 @@ class TwinTxTest(unittest.TestCase):
         add_new_blocks(self.manager, 1, advance_clock=1)
         add_blocks_unlock_reward(self.manager)
         self.tx = add_new_transactions(self.manager, 1, advance_clock=1)[0]
+        self.tx_struct = self.tx.get_struct()
+        self.tx_struct_hex = self.tx_struct.hex()
 
         self.parser = create_parser()
 
     def test_twin(self):
         # Normal twin
-        params = ['--raw_tx', self.tx.get_struct().hex()]
+        params = ['--raw_tx', self.tx_struct_hex]
         args = self.parser.parse_args(params)
 
         f = StringIO()
-        with redirect_stdout(f):
-            execute(args)
+        execute(args, out=f)
 
         # Transforming prints str in array
-        output = f.getvalue().split('\n')
-        # Last element is always empty string
-        output.pop()
+        output = f.getvalue().splitlines()
 
         twin_tx = Transaction.create_from_struct(bytes.fromhex(output[0]))
         # Parents are the same but in different order
         self.assertEqual(twin_tx.parents[0], self.tx.parents[1])
         self.assertEqual(twin_tx.parents[1], self.tx.parents[0])
 
-        # Testing metadata creation from json
-        meta_before_conflict = self.tx.get_metadata()
-        meta_before_conflict_json = meta_before_conflict.to_json()
-        del meta_before_conflict_json['conflict_with']
-        del meta_before_conflict_json['voided_by']
-        del meta_before_conflict_json['twins']
-        new_meta = TransactionMetadata.create_from_json(meta_before_conflict_json)
-        self.assertEqual(meta_before_conflict, new_meta)
-
         self.manager.propagate_tx(twin_tx)
 
         # Validate they are twins
@@ -70,23 +53,30 @@ class TwinTxTest(unittest.TestCase):
         meta2 = twin_tx.get_metadata()
         self.assertFalse(meta == meta2)
 
-    @ut.skip
     def test_twin_different(self):
-        server = run_server()
-
-        # Unlock wallet to start mining
-        request_server('wallet/unlock', 'POST', data={'passphrase': '123'})
-
-        # Mining
-        execute_mining(count=2)
-
-        # Generating txs
-        execute_tx_gen(count=4)
-
-        response = request_server('transaction', 'GET', data={b'count': 4, b'type': 'tx'})
+        # Getting a single tx from the API needs the tokens index, so this test uses its own indexed peer
+        manager = self.create_peer(self.network, unlock_wallet=True, wallet_index=True)
+        add_new_blocks(manager, 1, advance_clock=1)
+        add_blocks_unlock_reward(manager)
+
+        # Serve the tx storage API in-process, during the test the cli requests are routed to it
+        webs = {
+            'transaction': StubSite(TransactionResource(manager)),
+            'tips': StubSite(TipsResource(manager)),
+        }
+        web = webs['transaction']
+
+        def get(url, params=None):
+            path = urllib.parse.urlparse(url).path.strip('/').split('/')[-1]
+            request = self.successResultOf(webs[path].get(path, params))
+            return Mock(json=request.json_value)
+
+        add_new_transactions(manager, 4, advance_clock=1)
+
+        response = self.successResultOf(web.get('transaction', {b'count': 4, b'type': b'tx'})).json_value()
         tx = response['transactions'][-1]
 
-        response = request_server('transaction', 'GET', data={b'id': tx['tx_id']})
+        response = self.successResultOf(web.get('transaction', {b'id': tx['tx_id'].encode()})).json_value()
         tx = response['tx']
 
         # Twin different weight and parents
@@ -95,13 +85,11 @@ class TwinTxTest(unittest.TestCase):
         args = self.parser.parse_args(params)
 
         f = StringIO()
-        with redirect_stdout(f):
-            execute(args)
+        with patch('hathor.cli.twin_tx.requests.get', get):
+            execute(args, out=f)
 
         # Transforming prints str in array
-        output = f.getvalue().split('\n')
-        # Last element is always empty string
-        output.pop()
+        output = f.getvalue().splitlines()
 
         twin_tx = Transaction.create_from_struct(bytes.fromhex(output[0]))
         # Parents are differents
@@ -113,24 +101,19 @@ class TwinTxTest(unittest.TestCase):
         self.assertNotEqual(twin_tx.weight, tx['weight'])
         self.assertEqual(twin_tx.weight, 14.0)
 
-        server.terminate()
-
     def test_twin_human(self):
         # Twin in human form
-        params = ['--raw_tx', self.tx.get_struct().hex(), '--human']
+        params = ['--raw_tx', self.tx_struct_hex, '--human']
         args = self.parser.parse_args(params)
 
         f = StringIO()
-        with redirect_stdout(f):
-            execute(args)
+        execute(args, out=f)
 
         # Transforming prints str in array
-        output = f.getvalue().split('\n')
-        # Last element is always empty string
-        output.pop()
+        output = f.getvalue().splitlines()
 
         human = output[0].replace("'", '"')
-        tx_data = json.loads(human)
+        tx_data = json_loads(human)
 
         self.assertTrue(isinstance(tx_data, dict))
         self.assertTrue('hash' in tx_data)
@@ -142,18 +125,14 @@ class TwinTxTest(unittest.TestCase):
 
     def test_struct_error(self):
         # Struct error
-        tx_hex = self.tx.get_struct().hex()
-        params = ['--raw_tx', tx_hex + 'aa']
+        params = ['--raw_tx', self.tx_struct_hex + 'aa']
         args = self.parser.parse_args(params)
 
         f = StringIO()
-        with redirect_stdout(f):
-            execute(args)
+        execute(args, out=f)
 
         # Transforming prints str in array
-        output = f.getvalue().split('\n')
-        # Last element is always empty string
-        output.pop()
+        output = f.getvalue().splitlines()
 
         self.assertEqual('Error getting transaction from bytes', output[0])
 
@@ -162,12 +141,9 @@ class TwinTxTest(unittest.TestCase):
         args = self.parser.parse_args([])
 
         f = StringIO()
-        with redirect_stdout(f):
-            execute(args)
+        execute(args, out=f)
 
         # Transforming prints str in array
-        output = f.getvalue().split('\n')
-        # Last element is always empty string
-        output.pop()
+        output = f.getvalue().splitlines()
 
         self.assertEqual('The command expects raw_tx or hash and url as parameters', output[0])
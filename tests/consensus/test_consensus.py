@@ -1,3 +1,5 @@
+from hathor.transaction import Block
+from hathor.transaction.exceptions import PowError
 from hathor.transaction.storage import TransactionMemoryStorage
 from tests import unittest
 from tests.utils import (
@@ -8,6 +10,15 @@ from tests.utils import (
     add_new_transactions,
 )
 
+# Kept before setUp patches it, to check that the real verification still runs
+_verify_pow = Block.verify_pow
+
+
+def _resolve_without_pow(block, update_time=True):
+    block.nonce = 0
+    block.update_hash()
+    return True
+
 
 class ConsensusTestCase(unittest.TestCase):
     def setUp(self):
@@ -17,9 +28,15 @@ class ConsensusTestCase(unittest.TestCase):
         self.genesis_blocks = [tx for tx in self.genesis if tx.is_block]
         self.genesis_txs = [tx for tx in self.genesis if not tx.is_block]
 
-    def test_revert_block_high_weight(self):
-        """ A conflict transaction will be propagated. At first, it will be voided.
-        But, a new block with high weight will verify it, which will flip it to executed.
+        # Block PoW is skipped, not just b0's: consensus here depends on block weights only, never on the nonce
+        self.patch(Block, 'resolve', _resolve_without_pow)
+        self.patch(Block, 'verify_pow', lambda self, override_weight=None: None)
+
+    def _create_conflict(self, *, use_same_parents=False):
+        """ Build the history shared by all scenarios: a few blocks, some transactions, a double spending
+        transaction and a few more transactions on top of it.
+
+        :return: the manager, the first blocks mined and the conflicting transaction
         """
         self.assertEqual(len(self.genesis_blocks), 1)
         manager = self.create_peer('testnet', tx_storage=self.tx_storage)
@@ -32,11 +49,33 @@ class ConsensusTestCase(unittest.TestCase):
         add_new_transactions(manager, 5, advance_clock=15)
 
         # Create a double spending transaction.
-        conflicting_tx = add_new_double_spending(manager, use_same_parents=True)
+        conflicting_tx = add_new_double_spending(manager, use_same_parents=use_same_parents)
 
         # Add a few transactions.
         add_new_transactions(manager, 10, advance_clock=15)
 
+        return manager, blocks, conflicting_tx
+
+    def test_real_verify_pow_rejects_bad_nonce(self):
+        manager = self.create_peer('testnet', tx_storage=self.tx_storage)
+        block = add_new_block(manager, advance_clock=15)
+
+        # With this weight, nonce 0 is practically never a solution
+        bad_block = Block.create_from_struct(block.get_struct(), storage=self.tx_storage)
+        bad_block.weight = 60
+        _resolve_without_pow(bad_block)
+
+        # The patched verification accepts it, the real one doesn't
+        bad_block.verify_pow()
+        with self.assertRaises(PowError):
+            _verify_pow(bad_block)
+
+    def test_revert_block_high_weight(self):
+        """ A conflict transaction will be propagated. At first, it will be voided.
+        But, a new block with high weight will verify it, which will flip it to executed.
+        """
+        manager, blocks, conflicting_tx = self._create_conflict(use_same_parents=True)
+
         meta = conflicting_tx.get_metadata()
         self.assertEqual(meta.voided_by, {conflicting_tx.hash})
         for parent_hash in conflicting_tx.parents:
@@ -84,21 +123,7 @@ class ConsensusTestCase(unittest.TestCase):
         A new block with low weight will verify it, which won't be enough to flip to executed.
         So, it will remain voided.
         """
-        self.assertEqual(len(self.genesis_blocks), 1)
-        manager = self.create_peer('testnet', tx_storage=self.tx_storage)
-
-        # Mine a few blocks in a row with no transaction but the genesis
-        blocks = add_new_blocks(manager, 3, advance_clock=15)
-        add_blocks_unlock_reward(manager)
-
-        # Add some transactions between blocks
-        add_new_transactions(manager, 5, advance_clock=15)
-
-        # Create a double spending transaction.
-        conflicting_tx = add_new_double_spending(manager, use_same_parents=True)
-
-        # Add a few transactions.
-        add_new_transactions(manager, 10, advance_clock=15)
+        manager, blocks, conflicting_tx = self._create_conflict(use_same_parents=True)
 
         meta = conflicting_tx.get_metadata()
         self.assertEqual(meta.voided_by, {conflicting_tx.hash})
@@ -138,26 +163,10 @@ class ConsensusTestCase(unittest.TestCase):
         verifies its conflicting transaction. So, its accumulated weight will always be smaller
         than the others and it will never be executed.
         """
-        self.assertEqual(len(self.genesis_blocks), 1)
-        manager = self.create_peer('testnet', tx_storage=self.tx_storage)
-
-        # Mine a few blocks in a row with no transaction but the genesis
-        blocks = add_new_blocks(manager, 3, advance_clock=15)
-        add_blocks_unlock_reward(manager)
-
-        # Add some transactions between blocks
-        add_new_transactions(manager, 5, advance_clock=15)
-
-        # Create a double spending transaction.
-        conflicting_tx = add_new_double_spending(manager)
+        manager, blocks, conflicting_tx = self._create_conflict()
         meta = conflicting_tx.get_metadata()
         self.assertEqual(len(meta.conflict_with), 1)
         self.assertIn(list(meta.conflict_with)[0], conflicting_tx.parents)
-
-        # Add a few transactions.
-        add_new_transactions(manager, 10, advance_clock=15)
-
-        meta = conflicting_tx.get_metadata()
         self.assertEqual(meta.voided_by, {conflicting_tx.hash})
 
         # These blocks will be voided later.
@@ -194,21 +203,7 @@ class ConsensusTestCase(unittest.TestCase):
         """ A conflicting transaction will be propagated and voided. But the block with high weight
         verifies both the conflicting transactions, so this block will always be voided.
         """
-        self.assertEqual(len(self.genesis_blocks), 1)
-        manager = self.create_peer('testnet', tx_storage=self.tx_storage)
-
-        # Mine a few blocks in a row with no transaction but the genesis
-        add_new_blocks(manager, 3, advance_clock=15)
-        add_blocks_unlock_reward(manager)
-
-        # Add some transactions between blocks
-        add_new_transactions(manager, 5, advance_clock=15)
-
-        # Create a double spending transaction.
-        conflicting_tx = add_new_double_spending(manager, use_same_parents=True)
-
-        # Add a few transactions.
-        add_new_transactions(manager, 10, advance_clock=15)
+        manager, _, conflicting_tx = self._create_conflict(use_same_parents=True)
 
         meta = conflicting_tx.get_metadata()
         self.assertEqual(meta.voided_by, {conflicting_tx.hash})
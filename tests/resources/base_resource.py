@@ -5,14 +5,15 @@ from twisted.web import server
 from twisted.web.test.requesthelper import DummyRequest
 
 from hathor.manager import HathorManager, TestMode
-from hathor.p2p.peer_id import PeerId
 from tests import unittest
+from tests.utils import json_loads
 
 
 class _BaseResourceTest:
     class _ResourceTest(unittest.TestCase):
         def _manager_kwargs(self):
-            peer_id = PeerId()
+            # resource tests never connect to other peers
+            peer_id = self.get_shared_peer_id()
             network = 'testnet'
             wallet = self._create_test_wallet()
             tx_storage = getattr(self, 'tx_storage', None)
@@ -64,7 +65,7 @@ class TestDummyRequest(DummyRequest):
             self.addArg(k, v)
 
     def json_value(self):
-        return json.loads(self.written[0].decode('utf-8'))
+        return json_loads(self.written[0])
 
 
 class StubSite(server.Site):
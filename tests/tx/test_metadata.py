@@ -0,0 +1,20 @@
+from hathor.transaction import TransactionMetadata
+from hathor.transaction.storage import TransactionMemoryStorage
+from tests import unittest
+
+
+class TransactionMetadataTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tx_storage = TransactionMemoryStorage()
+        self.tx = next(tx for tx in self.tx_storage.get_all_genesis() if not tx.is_block)
+
+    def test_metadata_from_json(self):
+        # Metadata saved before conflicts and twins were tracked must still be loaded
+        meta = self.tx.get_metadata()
+        meta_json = meta.to_json()
+        del meta_json['conflict_with']
+        del meta_json['voided_by']
+        del meta_json['twins']
+        new_meta = TransactionMetadata.create_from_json(meta_json)
+        self.assertEqual(meta, new_meta)
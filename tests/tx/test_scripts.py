@@ -1,5 +1,6 @@
 import struct
 
+import base58
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
 
@@ -48,16 +49,34 @@ from hathor.wallet import HDWallet
 from tests import unittest
 from tests.utils import get_genesis_key
 
+INTEGER_OPCODES = tuple(getattr(Opcode, 'OP_{}'.format(i)) for i in range(17))
+
 
 class BasicTransaction(unittest.TestCase):
+    # read genesis keys, they are immutable and can be shared by all tests
+    genesis_private_key = get_genesis_key()
+    genesis_public_key = genesis_private_key.public_key()
+    genesis_pubkey_bytes = get_public_key_bytes_compressed(genesis_public_key)
+
+    genesis_address = get_address_from_public_key(genesis_public_key)
+    genesis_p2pkh_script = P2PKH.create_output_script(genesis_address)
+
+    # P2PKH output scripts of some unrelated addresses
+    p2pkh_scripts = tuple(P2PKH.create_output_script(base58.b58decode(address)) for address in (
+        '15d14K5jMqsN2uwUEFqiPG5SoD7Vr1BfnH',
+        '1K35zJQeYrVzQAW7X3s7vbPKmngj5JXTBc',
+        '1MnHN3D41yaMN5WLLKPARRdF77USvPLDfy',
+    ))
+
+    # length-prefixed values, as read by get_data_value, shared by the op_data_* tests
+    data_values = (b'value0', b'vvvalue1', b'vvvvvalue2')
+    data = b''.join(bytes([len(value)]) + value for value in data_values)
+
     def setUp(self):
         super().setUp()
-        self.genesis_blocks = [tx for tx in get_genesis_transactions(None) if tx.is_block]
-        self.genesis_txs = [tx for tx in get_genesis_transactions(None) if not tx.is_block]
-
-        # read genesis keys
-        self.genesis_private_key = get_genesis_key()
-        self.genesis_public_key = self.genesis_private_key.public_key()
+        genesis = get_genesis_transactions(None)
+        self.genesis_blocks = [tx for tx in genesis if tx.is_block]
+        self.genesis_txs = [tx for tx in genesis if not tx.is_block]
 
     def test_data_pattern(self):
         # up to 75 bytes, no Opcode is needed
@@ -195,7 +214,7 @@ class BasicTransaction(unittest.TestCase):
         data_to_sign = tx.get_sighash_all()
         hashed_data = hashlib.sha256(data_to_sign).digest()
         signature = self.genesis_private_key.sign(hashed_data, ec.ECDSA(hashes.SHA256()))
-        pubkey_bytes = get_public_key_bytes_compressed(self.genesis_public_key)
+        pubkey_bytes = self.genesis_pubkey_bytes
 
         extras = ScriptExtras(tx=tx, txin=None, spent_tx=None)
 
@@ -224,7 +243,7 @@ class BasicTransaction(unittest.TestCase):
 
         data = b'some_random_data'
         signature = self.genesis_private_key.sign(data, ec.ECDSA(hashes.SHA256()))
-        pubkey_bytes = get_public_key_bytes_compressed(self.genesis_public_key)
+        pubkey_bytes = self.genesis_pubkey_bytes
 
         stack = [data, signature, pubkey_bytes]
         # no exception should be raised and data is left on stack
@@ -236,11 +255,8 @@ class BasicTransaction(unittest.TestCase):
             op_checkdatasig(stack, log=[], extras=None)
 
     def test_get_data_value(self):
-        value0 = b'value0'
-        value1 = b'vvvalue1'
-        value2 = b'vvvvvalue2'
-
-        data = (bytes([len(value0)]) + value0 + bytes([len(value1)]) + value1 + bytes([len(value2)]) + value2)
+        value0, value1, value2 = self.data_values
+        data = self.data
 
         self.assertEqual(get_data_value(0, data), value0)
         self.assertEqual(get_data_value(1, data), value1)
@@ -256,11 +272,8 @@ class BasicTransaction(unittest.TestCase):
         with self.assertRaises(MissingStackItems):
             op_data_strequal([1, 1], log=[], extras=None)
 
-        value0 = b'value0'
-        value1 = b'vvvalue1'
-        value2 = b'vvvvvalue2'
-
-        data = (bytes([len(value0)]) + value0 + bytes([len(value1)]) + value1 + bytes([len(value2)]) + value2)
+        value0 = self.data_values[0]
+        data = self.data
 
         stack = [data, 0, value0]
         op_data_strequal(stack, log=[], extras=None)
@@ -372,18 +385,9 @@ class BasicTransaction(unittest.TestCase):
         with self.assertRaises(MissingStackItems):
             op_find_p2pkh([], log=[], extras=None)
 
-        addr1 = '15d14K5jMqsN2uwUEFqiPG5SoD7Vr1BfnH'
-        addr2 = '1K35zJQeYrVzQAW7X3s7vbPKmngj5JXTBc'
-        addr3 = '1MnHN3D41yaMN5WLLKPARRdF77USvPLDfy'
-
-        import base58
-        out1 = P2PKH.create_output_script(base58.b58decode(addr1))
-        out2 = P2PKH.create_output_script(base58.b58decode(addr2))
-        out3 = P2PKH.create_output_script(base58.b58decode(addr3))
-
-        # read genesis keys
-        genesis_address = get_address_from_public_key(self.genesis_public_key)
-        out_genesis = P2PKH.create_output_script(genesis_address)
+        out1, out2, out3 = self.p2pkh_scripts
+        genesis_address = self.genesis_address
+        out_genesis = self.genesis_p2pkh_script
 
         from hathor.transaction import Transaction, TxOutput, TxInput
         spent_tx = Transaction(outputs=[TxOutput(1, b'nano_contract_code')])
@@ -445,7 +449,7 @@ class BasicTransaction(unittest.TestCase):
         with self.assertRaises(MissingStackItems):
             op_checkmultisig([], log=[], extras=None)
 
-        block = [x for x in get_genesis_transactions(None) if x.is_block][0]
+        block = self.genesis_blocks[0]
 
         from hathor.transaction import Transaction, TxInput, TxOutput
         txin = TxInput(tx_id=block.hash, index=0, data=b'')
@@ -459,19 +463,20 @@ class BasicTransaction(unittest.TestCase):
         wallet._manually_initialize()
         wallet.words = wallet.mnemonic.generate()
         wallet._manually_initialize()
+        private_keys = list(wallet.keys.values())
 
         keys_count = 3
         keys = []
 
         for i in range(keys_count):
-            privkey = list(wallet.keys.values())[i]
+            privkey = private_keys[i]
             keys.append({
                 'privkey': privkey,
                 'pubkey': privkey.sec(),
                 'signature': wallet.get_input_aux_data(data_to_sign, privkey)[1]
             })
 
-        wrong_privkey = list(wallet.keys.values())[3]
+        wrong_privkey = private_keys[3]
         wrong_key = {
             'privkey': wrong_privkey,
             'pubkey': wrong_privkey.sec(),
@@ -520,6 +525,14 @@ class BasicTransaction(unittest.TestCase):
         op_checkmultisig(stack, log=[], extras=extras)
         self.assertEqual(0, stack.pop())
 
+        # A wrong signature is checked against all the public keys left, so a malformed one is still decoded
+        malformed_pubkey = b'\x05' + 32 * b'\x00'
+        stack = [
+            keys[0]['signature'], wrong_key['signature'], 2, malformed_pubkey, keys[1]['pubkey'], keys[2]['pubkey'], 3
+        ]
+        with self.assertRaises(ValueError):
+            op_checkmultisig(stack, log=[], extras=extras)
+
         # Adding less signatures than required, so we get error
         stack = [keys[0]['signature'], 2, keys[0]['pubkey'], keys[1]['pubkey'], keys[2]['pubkey'], 3]
         with self.assertRaises(MissingStackItems):
@@ -572,9 +585,9 @@ class BasicTransaction(unittest.TestCase):
 
     def test_integer_opcode(self):
         # We have opcodes from OP_0 to OP_16
-        for i in range(0, 17):
+        for i, opcode in enumerate(INTEGER_OPCODES):
             stack = []
-            op_integer(getattr(Opcode, 'OP_{}'.format(i)), stack, [], None)
+            op_integer(opcode, stack, [], None)
             self.assertEqual(stack, [i])
 
         stack = []
@@ -1,5 +1,3 @@
-from math import inf
-
 from hathor.transaction.storage.traversal import BFSWalk, DFSWalk
 from tests import unittest
 from tests.utils import add_blocks_unlock_reward, add_new_blocks, add_new_transactions, add_new_tx
@@ -10,7 +8,7 @@ class _BaseTraversalTestCase:
         def setUp(self):
             super().setUp()
 
-            self.manager = self.create_peer(network='testnet')
+            self.manager = self.create_peer(network='testnet', peer_id=self.get_shared_peer_id())
 
             self.hashes_before = set()
             for genesis in self.manager.tx_storage.get_all_genesis():
@@ -90,22 +88,18 @@ class BFSWalkTestCase(_BaseTraversalTestCase._TraversalTestCase):
         return BFSWalk(self.manager.tx_storage, **kwargs)
 
     def _run_lr(self, walk, skip_root=True):
-        seen = set()
-        last_timestamp = 0
-        for tx in walk.run(self.root_tx, skip_root=skip_root):
-            seen.add(tx.hash)
-            self.assertGreaterEqual(tx.timestamp, last_timestamp)
-            last_timestamp = tx.timestamp
-        return seen
+        txs = list(walk.run(self.root_tx, skip_root=skip_root))
+        # the walk must yield the transactions sorted by timestamp
+        timestamps = [tx.timestamp for tx in txs]
+        self.assertEqual(timestamps, sorted(timestamps))
+        return {tx.hash for tx in txs}
 
     def _run_rl(self, walk):
-        seen = set()
-        last_timestamp = inf
-        for tx in walk.run(self.root_tx, skip_root=True):
-            seen.add(tx.hash)
-            self.assertLessEqual(tx.timestamp, last_timestamp)
-            last_timestamp = tx.timestamp
-        return seen
+        txs = list(walk.run(self.root_tx, skip_root=True))
+        # the walk must yield the transactions sorted by timestamp, in reverse order
+        timestamps = [tx.timestamp for tx in txs]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+        return {tx.hash for tx in txs}
 
 
 class DFSWalkTestCase(_BaseTraversalTestCase._TraversalTestCase):
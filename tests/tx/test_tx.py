@@ -34,20 +34,23 @@ settings = HathorSettings()
 
 
 class BasicTransaction(unittest.TestCase):
+    # read genesis keys, they are immutable and can be shared by all tests
+    genesis_private_key = get_genesis_key()
+    genesis_public_key = genesis_private_key.public_key()
+    genesis_address = get_address_from_public_key(genesis_public_key)
+    genesis_p2pkh_script = P2PKH.create_output_script(genesis_address)
+
     def setUp(self):
         super().setUp()
-        self.wallet = Wallet()
+        self.wallet = Wallet(directory=None)
         self.tx_storage = TransactionMemoryStorage()
         self.genesis = self.tx_storage.get_all_genesis()
         self.genesis_blocks = [tx for tx in self.genesis if tx.is_block]
         self.genesis_txs = [tx for tx in self.genesis if not tx.is_block]
 
-        # read genesis keys
-        self.genesis_private_key = get_genesis_key()
-        self.genesis_public_key = self.genesis_private_key.public_key()
-
         # this makes sure we can spend the genesis outputs
-        self.manager = self.create_peer('testnet', tx_storage=self.tx_storage, unlock_wallet=True)
+        self.manager = self.create_peer('testnet', peer_id=self.get_shared_peer_id(), tx_storage=self.tx_storage,
+                                        unlock_wallet=True)
         blocks = add_blocks_unlock_reward(self.manager)
         self.last_block = blocks[-1]
 
@@ -58,8 +61,7 @@ class BasicTransaction(unittest.TestCase):
 
         # spend less than what was generated
         value = genesis_block.outputs[0].value - 1
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
         tx = Transaction(inputs=[_input], outputs=[output], storage=self.tx_storage)
 
@@ -83,8 +85,7 @@ class BasicTransaction(unittest.TestCase):
         _input = TxInput(genesis_block.hash, 0, b'')
         value = genesis_block.outputs[0].value
 
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         tx = Transaction(inputs=[_input], outputs=[output], storage=self.tx_storage,
@@ -127,8 +128,7 @@ class BasicTransaction(unittest.TestCase):
         _input = TxInput(genesis_block.hash, 0, b'')
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         tx = Transaction(nonce=100, inputs=[_input], outputs=[output], parents=parents, storage=self.tx_storage)
@@ -172,8 +172,7 @@ class BasicTransaction(unittest.TestCase):
 
         tx_inputs = [TxInput(genesis_block.hash, 0, b'')]
 
-        address = get_address_from_public_key(self.genesis_public_key)
-        output_script = P2PKH.create_output_script(address)
+        output_script = self.genesis_p2pkh_script
         tx_outputs = [TxOutput(100, output_script)]
 
         block = Block(
@@ -196,8 +195,7 @@ class BasicTransaction(unittest.TestCase):
         # a block should have no more than MAX_NUM_OUTPUTS outputs
         parents = [tx.hash for tx in self.genesis]
 
-        address = get_address_from_public_key(self.genesis_public_key)
-        output_script = P2PKH.create_output_script(address)
+        output_script = self.genesis_p2pkh_script
         tx_outputs = [TxOutput(100, output_script)] * (MAX_NUM_OUTPUTS + 1)
 
         block = Block(
@@ -216,8 +214,7 @@ class BasicTransaction(unittest.TestCase):
         _input = TxInput(genesis_block.hash, 0, b'')
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         parents = [self.genesis_txs[0].hash]
@@ -248,8 +245,7 @@ class BasicTransaction(unittest.TestCase):
             tx.verify()
 
     def test_block_unknown_parent(self):
-        address = get_address_from_public_key(self.genesis_public_key)
-        output_script = P2PKH.create_output_script(address)
+        output_script = self.genesis_p2pkh_script
         tx_outputs = [TxOutput(100, output_script)]
 
         # Random unknown parent
@@ -267,8 +263,7 @@ class BasicTransaction(unittest.TestCase):
             block.verify()
 
     def test_block_number_parents(self):
-        address = get_address_from_public_key(self.genesis_public_key)
-        output_script = P2PKH.create_output_script(address)
+        output_script = self.genesis_p2pkh_script
         tx_outputs = [TxOutput(100, output_script)]
 
         parents = [tx.hash for tx in self.genesis_txs]
@@ -290,8 +285,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         _input = TxInput(genesis_block.hash, len(genesis_block.outputs) + 1, b'')
@@ -329,8 +323,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         # We can't only duplicate the value because genesis is using the max value possible
         outputs = [TxOutput(value, script), TxOutput(value, script)]
 
@@ -352,8 +345,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         _input = TxInput(genesis_block.hash, 0, b'')
@@ -373,8 +365,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         _input = TxInput(genesis_block.hash, 0, b'')
@@ -396,8 +387,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         _input = TxInput(genesis_block.hash, 0, b'')
@@ -419,8 +409,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         _input = TxInput(genesis_block.hash, 0, b'')
@@ -440,8 +429,7 @@ class BasicTransaction(unittest.TestCase):
         genesis_block = self.genesis_blocks[0]
 
         value = genesis_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output = TxOutput(value, script)
 
         # update based on input
@@ -598,13 +586,15 @@ class BasicTransaction(unittest.TestCase):
         struct_bytes = tx.get_funds_struct()
 
         # we'll get the struct without the last output bytes and add it ourselves
-        struct_bytes = struct_bytes[:-7]
         # add small value using 8 bytes and expect failure when trying to deserialize
-        struct_bytes += (-1).to_bytes(8, byteorder='big', signed=True)
-        struct_bytes += int_to_bytes(0, 1)
-        struct_bytes += int_to_bytes(0, 2)
-        struct_bytes += tx.get_graph_struct()
-        struct_bytes += int_to_bytes(tx.nonce, tx.SERIALIZATION_NONCE_SIZE)
+        struct_bytes = b''.join([
+            struct_bytes[:-7],
+            (-1).to_bytes(8, byteorder='big', signed=True),
+            int_to_bytes(0, 1),
+            int_to_bytes(0, 2),
+            tx.get_graph_struct(),
+            int_to_bytes(tx.nonce, tx.SERIALIZATION_NONCE_SIZE),
+        ])
 
         len_difference = len(struct_bytes) - len(original_struct)
         assert len_difference == 4, 'new struct is incorrect, len difference={}'.format(len_difference)
@@ -663,8 +653,7 @@ class BasicTransaction(unittest.TestCase):
 
     def test_output_sum_ignore_authority(self):
         # sum of tx outputs should ignore authority outputs
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         output1 = TxOutput(5, script)   # regular utxo
         output2 = TxOutput(30, script, 0b10000001)   # authority utxo
         output3 = TxOutput(3, script)   # regular utxo
@@ -674,8 +663,7 @@ class BasicTransaction(unittest.TestCase):
 
     def _spend_reward_tx(self, manager, reward_block):
         value = reward_block.outputs[0].value
-        address = get_address_from_public_key(self.genesis_public_key)
-        script = P2PKH.create_output_script(address)
+        script = self.genesis_p2pkh_script
         input_ = TxInput(reward_block.hash, 0, b'')
         output = TxOutput(value, script)
         tx = Transaction(
@@ -695,7 +683,7 @@ class BasicTransaction(unittest.TestCase):
     def test_reward_lock(self):
         from hathor.transaction.exceptions import RewardLocked
         # add block with a reward we can spend
-        reward_block = self.manager.generate_mining_block(address=get_address_from_public_key(self.genesis_public_key))
+        reward_block = self.manager.generate_mining_block(address=self.genesis_address)
         reward_block.resolve()
         self.assertTrue(self.manager.propagate_tx(reward_block))
         # reward cannot be spent while not enough blocks are added
@@ -711,7 +699,7 @@ class BasicTransaction(unittest.TestCase):
     def test_reward_lock_timestamp(self):
         from hathor.transaction.exceptions import RewardLocked
         # add block with a reward we can spend
-        reward_block = self.manager.generate_mining_block(address=get_address_from_public_key(self.genesis_public_key))
+        reward_block = self.manager.generate_mining_block(address=self.genesis_address)
         reward_block.resolve()
         self.assertTrue(self.manager.propagate_tx(reward_block))
 
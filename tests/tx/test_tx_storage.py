@@ -4,6 +4,7 @@ import tempfile
 import time
 import unittest
 from itertools import chain
+from unittest.mock import patch
 
 from twisted.internet.task import Clock
 
@@ -30,6 +31,12 @@ from tests.utils import (
     start_remote_storage,
 )
 
+try:
+    from hathor.transaction.storage import TransactionLMDBStorage
+except ImportError:
+    # lmdb is an optional dependency
+    TransactionLMDBStorage = None
+
 settings = HathorSettings()
 
 
@@ -436,5 +443,26 @@ class TransactionRocksDBStorageTest(_BaseTransactionStorageTest._TransactionStor
         super().tearDown()
 
 
+@unittest.skipIf(TransactionLMDBStorage is None, 'lmdb is not installed')
+class TransactionLMDBStorageTest(_BaseTransactionStorageTest._TransactionStorageTest):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        super().setUp(TransactionLMDBStorage(self.directory))
+
+    def test_get_all_transactions_in_batches(self):
+        from hathor.transaction.storage import lmdb_storage
+        self.tx_storage.save_transaction(self.block)
+        self.tx_storage.save_transaction(self.tx)
+        expected = [tx.hash for tx in chain(self.genesis, [self.block, self.tx])]
+        # a batch of one key forces a new read transaction for each saved transaction
+        with patch.object(lmdb_storage, '_ITER_BATCH_SIZE', 1):
+            hashes = [tx.hash for tx in self.tx_storage.get_all_transactions()]
+        self.assertEqual(sorted(hashes), sorted(expected))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super().tearDown()
+
+
 if __name__ == '__main__':
     unittest.main()
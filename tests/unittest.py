@@ -1,9 +1,8 @@
 import random
-import shutil
-import tempfile
 import time
+from functools import lru_cache
+from typing import Optional, Tuple
 
-import numpy.random
 from twisted.internet import reactor
 from twisted.internet.task import Clock
 from twisted.trial import unittest
@@ -13,23 +12,47 @@ from hathor.p2p.peer_id import PeerId
 from hathor.wallet import Wallet
 
 
+@lru_cache(maxsize=None)
+def _get_fixed_hd_wallet_addresses() -> Tuple[int, Tuple[str, ...]]:
+    """ Return the gap limit and the addresses of a fixed HD Wallet
+
+    Deriving the wallet (seed stretching and key generation) is slow and the result never changes, so it's done
+    only once for all tests.
+    """
+    from hathor.wallet import HDWallet
+    words = ('bind daring above film health blush during tiny neck slight clown salmon '
+             'wine brown good setup later omit jaguar tourist rescue flip pet salute')
+
+    hd = HDWallet(words=words)
+    hd._manually_initialize()
+
+    return hd.gap_limit, tuple(hd.keys.keys())
+
+
 class TestCase(unittest.TestCase):
+    _shared_peer_id: Optional[PeerId] = None
+
+    @classmethod
+    def get_shared_peer_id(cls) -> PeerId:
+        """ Return a peer id shared by all tests of this class
+
+        Generating a peer id is expensive (RSA key), so tests that never connect to other peers should use this one
+        instead of generating a new peer id for each manager.
+        """
+        if cls._shared_peer_id is None:
+            cls._shared_peer_id = PeerId()
+        return cls._shared_peer_id
+
     def setUp(self):
-        self.tmpdirs = []
         self.clock = Clock()
         self.clock.advance(time.time())
 
-    def tearDown(self):
-        self.clean_tmpdirs()
-
     def _create_test_wallet(self):
         """ Generate a Wallet with a number of keypairs for testing
             :rtype: Wallet
         """
-        tmpdir = tempfile.mkdtemp(dir='/tmp/')
-        self.tmpdirs.append(tmpdir)
-
-        wallet = Wallet(directory=tmpdir)
+        # the keys are kept only in memory, tests don't need them on disk
+        wallet = Wallet(directory=None)
         wallet.unlock(b'MYPASS')
         wallet.generate_keys(count=20)
         wallet.lock()
@@ -64,6 +87,8 @@ class TestCase(unittest.TestCase):
             self.clock.advance(amount)
 
     def set_random_seed(self, seed=None):
+        # numpy is slow to import and only needed by the few tests that use it
+        import numpy.random
         if seed is None:
             seed = numpy.random.randint(2**32)
         self.random_seed = seed
@@ -142,10 +167,6 @@ class TestCase(unittest.TestCase):
                 self.assertIsNotNone(meta.voided_by)
                 self.assertTrue(parent_meta.voided_by.issubset(meta.voided_by))
 
-    def clean_tmpdirs(self):
-        for tmpdir in self.tmpdirs:
-            shutil.rmtree(tmpdir)
-
     def clean_pending(self, required_to_quiesce=True):
         """
         This handy method cleans all pending tasks from the reactor.
@@ -186,17 +207,12 @@ class TestCase(unittest.TestCase):
         if required_to_quiesce and active:
             self.fail('Reactor was still active when it was required to be quiescent.')
 
-    def get_address(self, index: int) -> str:
+    def get_address(self, index: int) -> Optional[str]:
         """ Generate a fixed HD Wallet and return an address
         """
-        from hathor.wallet import HDWallet
-        words = ('bind daring above film health blush during tiny neck slight clown salmon '
-                 'wine brown good setup later omit jaguar tourist rescue flip pet salute')
-
-        hd = HDWallet(words=words)
-        hd._manually_initialize()
+        gap_limit, addresses = _get_fixed_hd_wallet_addresses()
 
-        if index >= hd.gap_limit:
+        if index >= gap_limit:
             return None
 
-        return list(hd.keys.keys())[index]
+        return addresses[index]
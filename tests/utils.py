@@ -4,10 +4,10 @@ import subprocess
 import time
 import urllib.parse
 from concurrent import futures
+from functools import lru_cache
 from typing import TYPE_CHECKING, List
 
 import grpc
-import numpy.random
 import requests
 from OpenSSL.crypto import X509
 from twisted.internet.task import Clock
@@ -27,6 +27,14 @@ from hathor.transaction.storage import (
 from hathor.transaction.token_creation_tx import TokenCreationTransaction
 from hathor.transaction.util import get_deposit_amount
 
+try:
+    # orjson is an optional faster drop-in for decoding the json in test responses
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+json_loads = _json.loads
+
 if TYPE_CHECKING:
     from hathor.p2p.peer_id import PeerId
 
@@ -126,7 +134,8 @@ def add_new_tx(manager, address, value, advance_clock=None):
         :return: Transaction created
         :rtype: :py:class:`hathor.transaction.transaction.Transaction`
     """
-    tx = gen_new_tx(manager, address, value)
+    # propagate_tx already runs the full verification and raises on failure
+    tx = gen_new_tx(manager, address, value, verify=False)
     manager.propagate_tx(tx, fails_silently=False)
     if advance_clock:
         manager.reactor.advance(advance_clock)
@@ -167,7 +176,7 @@ def add_new_block(manager, advance_clock=None, *, parent_block_hash=None, data=b
     if weight is not None:
         block.weight = weight
     block.resolve()
-    block.verify()
+    # propagate_tx already runs the full verification and raises on failure
     manager.propagate_tx(block, fails_silently=False)
     if advance_clock:
         manager.reactor.advance(advance_clock)
@@ -362,6 +371,8 @@ class MinerSimulator:
             self.manager.propagate_tx(self.block, fails_silently=False)
             self.block = None
 
+        import numpy.random
+
         block = self.manager.generate_mining_block()
         geometric_p = 2**(-block.weight)
         trials = numpy.random.geometric(geometric_p)
@@ -420,6 +431,8 @@ class RandomTransactionGenerator:
     def new_tx_step1(self):
         """ Generate a new transaction and schedule the mining part of the transaction.
         """
+        import numpy.random
+
         balance = self.manager.wallet.balance[settings.HATHOR_TOKEN_UID]
         if balance.available == 0 and self.ignore_no_funds:
             self.delayedcall = self.clock.callLater(0, self.schedule_next_transaction)
@@ -559,7 +572,9 @@ def execute_tx_gen(*, count, address=None, value=None, timestamp=None, host='htt
     execute(args)
 
 
+@lru_cache(maxsize=None)
 def get_genesis_key():
+    # The key is immutable, so it's decoded only once and the same object is shared
     private_key_bytes = base64.b64decode(
         'MIGEAgEAMBAGByqGSM49AgEGBSuBBAAKBG0wawIBAQQgOCgCddzDZsfKgiMJLOt97eov9RLwHeePyBIK2WPF8MChRA'
         'NCAAQ/XSOK+qniIY0F3X+lDrb55VQx5jWeBLhhzZnH6IzGVTtlAj9Ki73DVBm5+VXK400Idd6ddzS7FahBYYC7IaTl'
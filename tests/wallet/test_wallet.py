@@ -1,3 +1,4 @@
+import os
 import shutil
 import tempfile
 from collections import defaultdict
@@ -54,6 +55,24 @@ class BasicWallet(unittest.TestCase):
             key2 = w2.keys.pop(address)
             self.assertEqual(key, key2)
 
+    def test_wallet_in_memory(self):
+        # run from the temporary directory so a stray './keys.json' would show up there
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+        w = Wallet(directory=None)
+        self.assertIsNone(w.filepath)
+        w.unlock(PASSWORD)
+        w.generate_keys()
+        address = w.get_unused_address()
+        self.assertIn(address, w.keys)
+        w.lock()
+        w.unlock(PASSWORD)
+        w.get_unused_address()
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'keys.json')))
+
     def test_wallet_create_transaction(self):
         genesis_private_key_bytes = get_private_key_bytes(
             self.genesis_private_key,